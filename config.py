@@ -22,6 +22,13 @@ IS_REMOTE = True
 # Country parameter for Indeed and Glassdoor searches
 COUNTRY_INDEED = 'USA'
 
+# Reuse the scrape results of an earlier run on the same (UTC) day with the same search
+# parameters instead of scraping again. Useful when only tweaking filters or scoring.
+CACHE_SCRAPE_RESULTS = False
+
+# Directory for cached scrape results (Parquet files, requires pyarrow)
+SCRAPE_CACHE_DIR = ".scrape_cache"
+
 # Title filtering parameters
 # Titles must include at least one of these keywords (case-insensitive)
 TITLE_INCLUSION_REGEX = "software|engineer|sde|backend|fullstack|developer"
@@ -65,3 +72,6 @@ DROP_COLUMNS = [
     "listing_type",
 
 ]
+
+# Compress the output file with gzip (saved as .csv.gz)
+COMPRESS_OUTPUT = False
@@ -1,11 +1,25 @@
 #!/usr/bin/env python3
+import numpy as np
 import pandas as pd
 import csv
+import hashlib
+import pathlib
 import re
-from datetime import datetime
+from datetime import datetime, timezone
 from jobspy import scrape_jobs
 import config
 
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:  # pyarrow is optional; the pandas CSV writer is used without it.
+    pa = None
+
+try:
+    import numexpr as ne
+except ImportError:  # numexpr is optional; scores are computed with NumPy without it.
+    ne = None
+
 # Set of valid US state abbreviations (including DC)
 US_STATE_ABBREVS = {
     "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA", "HI", "ID", 
@@ -15,63 +29,160 @@ US_STATE_ABBREVS = {
     "WI", "WY", "DC"
 }
 
-def is_us_location(location):
+def build_state_bitset(states):
+    """
+    Packs two-letter uppercase codes into a 676-bit bitset (stored as uint64 words),
+    where code "XY" sets bit (X - 'A') * 26 + (Y - 'A').
+    """
+    bitset = np.zeros(26 * 26 // 64 + 1, dtype=np.uint64)
+    for state in states:
+        index = (ord(state[0]) - ord('A')) * 26 + ord(state[1]) - ord('A')
+        bitset[index >> 6] |= np.uint64(1) << np.uint64(index & 63)
+    return bitset
+
+US_STATE_BITSET = build_state_bitset(US_STATE_ABBREVS)
+
+def is_us_state(codes):
+    """
+    Returns a boolean array that is True where the code is a valid US state abbreviation.
+    codes is a Series of two-letter uppercase codes (missing values are never valid);
+    membership is a branchless gather and shift into US_STATE_BITSET.
+    """
+    chars = codes.fillna("").to_numpy(dtype='<U2').view(np.uint32).reshape(-1, 2).astype(np.int64) - ord('A')
+    present = chars[:, 0] >= 0
+    index = np.where(present, chars[:, 0] * 26 + chars[:, 1], 0)
+    bits = (US_STATE_BITSET[index >> 6] >> (index & 63).astype(np.uint64)) & np.uint64(1)
+    return present & (bits == 1)
+
+# Low-cardinality string columns stored as categoricals, so filters only look at
+# each distinct value once and rows carry small integer codes.
+CATEGORICAL_COLUMNS = ['site', 'location', 'job_type', 'interval']
+
+def category_mask(column, predicate, na=False):
+    """
+    Evaluates predicate (a function from a Series of values to a boolean Series) once per
+    category of a categorical column and maps the result onto every row through the
+    category codes. Missing values get na.
+    """
+    matches = np.asarray(predicate(column.cat.categories.to_series()), dtype=bool)
+    # Code -1 (missing) picks the trailing na entry.
+    return pd.Series(np.append(matches, na)[column.cat.codes.to_numpy()], index=column.index)
+
+# Columns the composite score is computed from; they are kept until scoring even when
+# they are listed in config.DROP_COLUMNS.
+SCORING_COLUMNS = {'description', 'min_amount', 'max_amount', 'is_remote'}
+
+# Title filters from config, compiled once (case-insensitive).
+TITLE_INCLUSION_PATTERN = re.compile(config.TITLE_INCLUSION_REGEX, re.IGNORECASE)
+TITLE_EXCLUSION_PATTERN = re.compile(config.TITLE_EXCLUSION_REGEX, re.IGNORECASE)
+
+# Keyword bonuses keyed by lowercase keyword (case variants of the same keyword add up).
+# Keywords whose bonuses total zero cannot change any score, so they are never scanned for.
+KEYWORD_SCORES = {
+    keyword: bonus
+    for keyword, bonus in {
+        keyword.lower(): sum(bonus for other, bonus in config.KEYWORD_SCORE_MAP.items() if other.lower() == keyword.lower())
+        for keyword in config.KEYWORD_SCORE_MAP
+    }.items()
+    if bonus
+}
+
+# Keyword columns of the keyword matrix and their bonus weights.
+KEYWORDS = list(KEYWORD_SCORES)
+KEYWORD_WEIGHTS = np.array([KEYWORD_SCORES[keyword] for keyword in KEYWORDS], dtype=np.int64)
+
+# Composite score as a single numexpr expression generated from the keyword weights, over
+# the keyword columns kw_0, kw_1, ... of the keyword matrix, salary and remote_bonus.
+# numexpr evaluates it in one fused, multi-threaded pass; NumPy 1.x caps an expression at
+# 32 operands including the output, so larger keyword maps use the NumPy path.
+KEYWORD_SCORE_EXPR = " + ".join(
+    [f"({weight}) * kw_{column}" for column, weight in enumerate(KEYWORD_WEIGHTS)] + ["salary", "remote_bonus"]
+)
+USE_NUMEXPR = ne is not None and len(KEYWORDS) + 2 < 32
+
+def keyword_matrix(jobs):
+    """
+    Returns a boolean matrix with one row per job and one column per entry of KEYWORDS,
+    marking which keywords appear (case-insensitively) in the job description.
+    """
+    if not KEYWORDS or 'description' not in jobs.columns:
+        return np.zeros((len(jobs), len(KEYWORDS)), dtype=bool)
+    # Lowercase the descriptions once as object dtype, which uses Python's str.lower (not Arrow's,
+    # which folds "İ" to a plain "i"), so the checks match `keyword in description.lower()` exactly.
+    descriptions = jobs['description'].fillna("").astype(str).astype(object).str.lower()
+    return np.column_stack(
+        [descriptions.str.contains(keyword, regex=False).to_numpy(dtype=bool) for keyword in KEYWORDS]
+    )
+
+# Terms that mark a location as US-based when found anywhere in it (case-insensitive).
+US_LOCATION_TERMS = ["remote", "us", "usa", "united states"]
+US_LOCATION_TERMS_PATTERN = re.compile("|".join(re.escape(term) for term in US_LOCATION_TERMS), re.IGNORECASE)
+# Pattern: "City, ST"
+STATE_SUFFIX_PATTERN = re.compile(r",\s*([A-Z]{2})$")
+
+def is_us_location(locations):
     """
-    Returns True if the location string indicates a US-based location.
-    Accepts explicit terms ("USA", "United States") or a pattern like "City, ST"
+    Returns a boolean Series that is True where the location string indicates a US-based location.
+    Accepts missing locations, explicit terms ("USA", "United States") or a pattern like "City, ST"
     where ST is a valid US state abbreviation.
     """
-    if pd.isnull(location):
-        return True
-    loc = location.strip()
+    locs = locations.fillna("").astype(str).str.strip()
     # Check if location explicitly contains US-related keywords.
-    if any(keyword in loc.lower() for keyword in ["remote", "us", "usa", "united states"]):
-        return True
-    # Check for pattern: "City, ST"
-    match = re.search(r",\s*([A-Z]{2})$", loc)
-    if not match:
-        return False
-    state = match.group(1)
-    if state in US_STATE_ABBREVS:
-        return True
-    return False
-
-def compute_composite_score(row):
-    """
-    Compute a composite score based on available salary information,
-    bonuses for keywords found in the job description, benefits bonus,
-    and a remote bonus.
-    """
-    # Retrieve salary values (from the job_function portion of the schema)
-    min_amount = row.get('min_amount')
-    max_amount = row.get('max_amount')
-    salary = 0
-    if pd.notnull(min_amount) and pd.notnull(max_amount):
-        salary = (min_amount + max_amount) / 2
-    elif pd.notnull(min_amount):
-        salary = min_amount
-    elif pd.notnull(max_amount):
-        salary = max_amount
-
-    # Convert description to lowercase string for analysis.
-    description = str(row.get('description', "")).lower()
-
-    # Keyword bonus from config.KEYWORD_SCORE_MAP
-    keyword_bonus = 0
-    for keyword, bonus in config.KEYWORD_SCORE_MAP.items():
-        if keyword.lower() in description:
-            keyword_bonus += bonus
+    explicit = locs.str.contains(US_LOCATION_TERMS_PATTERN)
+    # Check for pattern: "City, ST" with a valid state abbreviation.
+    states = locs.str.extract(STATE_SUFFIX_PATTERN, expand=False)
+    return locations.isnull() | explicit | is_us_state(states)
+
+def compute_composite_score(jobs, keyword_hits):
+    """
+    Compute a composite score for every job based on available salary information,
+    bonuses for keywords found in the job description (keyword_hits, as returned by
+    keyword_matrix), benefits bonus, and a remote bonus. Returns a Series aligned with
+    the index of jobs, as int32.
+    """
+    # Average whichever salary values are present (from the job_function portion of the schema);
+    # mean() skips missing values, so rows with neither fall back to 0. Only this scoring copy
+    # is narrowed to float32; the salary columns written to the CSV keep their precision.
+    salaries = jobs.reindex(columns=['min_amount', 'max_amount']).astype(np.float32)
+    salary = salaries.mean(axis=1).fillna(0).to_numpy(dtype=np.float64)
 
     # Remote bonus
-    remote_bonus = config.REMOTE_BONUS if config.IS_REMOTE and row.get('is_remote') else 0
+    remote_bonus = np.zeros(len(jobs))
+    if config.IS_REMOTE and 'is_remote' in jobs.columns:
+        remote_bonus = np.where(jobs['is_remote'].eq(True), config.REMOTE_BONUS, 0)
 
-    return salary + keyword_bonus + remote_bonus
+    # Keyword bonus from config.KEYWORD_SCORE_MAP, summed with the salary and remote bonus.
+    if USE_NUMEXPR:
+        local_dict = {f"kw_{column}": hits for column, hits in enumerate(np.ascontiguousarray(keyword_hits.T))}
+        local_dict.update(salary=salary, remote_bonus=remote_bonus)
+        scores = ne.evaluate(KEYWORD_SCORE_EXPR, local_dict=local_dict)
+    else:
+        scores = salary + keyword_hits @ KEYWORD_WEIGHTS + remote_bonus
 
-def main():
-    print("Scraping remote backend/fullstack software engineering jobs for US residents...")
+    # Store scores as int32 to keep the sort key narrow, clipping bogus salaries to the
+    # int32 range so they rank at the extremes instead of wrapping around.
+    int32 = np.iinfo(np.int32)
+    return pd.Series(np.clip(np.rint(scores), int32.min, int32.max).astype(np.int32), index=jobs.index)
 
-    # Scrape jobs from multiple boards using the python-jobspy library.
-    jobs = scrape_jobs(
+def ranking_order(jobs):
+    """
+    Returns the row positions that sort jobs by composite score and then by most recent
+    posting (if date_posted is available), both descending, with missing dates last.
+    Uses a single stable np.lexsort over int64 keys (the last key is the primary one).
+    """
+    keys = [-jobs['composite_score'].to_numpy(dtype=np.int64)]
+    if 'date_posted' in jobs.columns:
+        ticks = jobs['date_posted'].values.view('i8')
+        missing = jobs['date_posted'].isnull().to_numpy()
+        keys.insert(0, np.where(missing, np.iinfo(np.int64).max, -ticks))
+    return np.lexsort(keys)
+
+def scrape_all_sites():
+    """
+    Scrape jobs from every board in config.SITE_NAMES using the python-jobspy library
+    and the search parameters in config.
+    """
+    return scrape_jobs(
         site_name=config.SITE_NAMES,
         search_term=config.SEARCH_TERM,
         location=config.LOCATION,
@@ -81,80 +192,193 @@ def main():
         country_indeed=config.COUNTRY_INDEED
     )
 
+def scrape_cache_path():
+    """
+    Returns the cache file for today's (UTC) scrape with the current search parameters.
+    """
+    params = (
+        config.SITE_NAMES,
+        config.SEARCH_TERM,
+        config.LOCATION,
+        config.RESULTS_WANTED,
+        config.HOURS_OLD,
+        config.IS_REMOTE,
+        config.COUNTRY_INDEED,
+        datetime.now(timezone.utc).date(),
+    )
+    key = hashlib.sha1(repr(params).encode()).hexdigest()[:12]
+    return pathlib.Path(config.SCRAPE_CACHE_DIR) / f"{key}.parquet"
+
+# Errors from reading or writing the scrape cache: a missing Parquet engine, columns or files
+# Arrow cannot handle (ArrowInvalid is a ValueError, ArrowNotImplementedError a
+# NotImplementedError) and filesystem failures. None of them stop the run.
+SCRAPE_CACHE_ERRORS = (ImportError, ValueError, TypeError, NotImplementedError, OSError)
+
+def load_jobs():
+    """
+    Scrape all job boards, or reuse today's cached scrape for the same search parameters
+    when config.CACHE_SCRAPE_RESULTS is enabled. Non-empty scrapes are cached as Parquet,
+    which needs pyarrow; when the cache cannot be read the boards are scraped again, and
+    when it cannot be written the results are simply not cached.
+    """
+    if not config.CACHE_SCRAPE_RESULTS:
+        return scrape_all_sites()
+
+    cache = scrape_cache_path()
+    if cache.exists():
+        try:
+            jobs = pd.read_parquet(cache)
+            print(f"Using cached scrape results from {cache}.")
+            return jobs
+        except SCRAPE_CACHE_ERRORS as e:
+            print(f"Could not read cached scrape results, scraping again: {e}")
+
+    jobs = scrape_all_sites()
+    if not jobs.empty:
+        try:
+            cache.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so an interrupted run never leaves a partial cache.
+            partial = cache.with_suffix(".partial")
+            jobs.to_parquet(partial, index=False)
+            partial.replace(cache)
+        except SCRAPE_CACHE_ERRORS as e:
+            print(f"Could not cache scrape results: {e}")
+    return jobs
+
+# Rows per batch when the pandas CSV writer is used.
+CSV_CHUNK_SIZE = 10_000
+
+def write_csv(jobs, filename):
+    """
+    Export jobs to a CSV file with string values quoted, gzip-compressed when filename
+    ends in ".gz". Uses the PyArrow CSV writer when pyarrow is installed and falls back
+    to the pandas writer otherwise (or when a column cannot be converted to Arrow or
+    written as CSV by Arrow, such as list columns). The Arrow output differs from pandas
+    in writing booleans as true/false, missing values as bare empty fields, whole-number
+    floats without ".0" and timestamps with a time of day or time zone as
+    "YYYY-MM-DD HH:MM:SS.ffffff".
+    """
+    if pa is not None:
+        try:
+            table = pa.Table.from_pandas(jobs, preserve_index=False)
+            # Write date-only timestamp columns (such as date_posted) as quoted plain dates, like pandas does.
+            for col in jobs.columns:
+                if pd.api.types.is_datetime64_dtype(jobs[col]):
+                    dates = jobs[col].dropna()
+                    if (dates == dates.dt.normalize()).all():
+                        index = table.schema.get_field_index(col)
+                        table = table.set_column(index, col, table.column(index).cast(pa.date32()).cast(pa.string()))
+            write_options = pacsv.WriteOptions(quoting_style="needed")
+            if filename.endswith(".gz"):
+                with pa.CompressedOutputStream(filename, "gzip") as sink:
+                    pacsv.write_csv(table, sink, write_options=write_options)
+            else:
+                pacsv.write_csv(table, filename, write_options=write_options)
+            return
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            # Fall through to pandas, which overwrites anything Arrow wrote partially.
+            pass
+    # pandas infers gzip compression from the filename and writes in batches of CSV_CHUNK_SIZE rows.
+    jobs.to_csv(filename, quoting=csv.QUOTE_NONNUMERIC, escapechar="\\", index=False, chunksize=CSV_CHUNK_SIZE)
+
+def main():
+    print("Scraping remote backend/fullstack software engineering jobs for US residents...")
+
+    # Scrape jobs from multiple boards using the python-jobspy library (or today's cached scrape).
+    jobs = load_jobs()
+
     print(f"Found {len(jobs)} jobs before filtering.")
 
     if jobs.empty:
         print("No jobs found matching the criteria.")
         return
+
+    # Store low-cardinality string columns as categoricals.
+    for col in CATEGORICAL_COLUMNS:
+        if col in jobs.columns:
+            jobs[col] = jobs[col].astype('category')
     
-    # Filter in only jobs whose title matches inclusion keywords
-    jobs = jobs[jobs["title"].str.contains(config.TITLE_INCLUSION_REGEX, case=False, na=False)]
-    print(f"Jobs after title inclusion filter: {len(jobs)}.")
+    # Build a single row mask across all filters and slice the frame once at the end;
+    # each filter still reports how many jobs remain after it.
+    # Filter in only jobs whose title matches inclusion keywords.
+    keep = jobs["title"].str.contains(TITLE_INCLUSION_PATTERN, na=False)
+    print(f"Jobs after title inclusion filter: {keep.sum()}.")
     # Filter out job titles with irrelevant keywords (like "principal" or "intern")
-    jobs = jobs[~jobs["title"].str.contains(config.TITLE_EXCLUSION_REGEX, case=False, na=False)]
-    print(f"Jobs after title exclusion filter: {len(jobs)}.")
+    keep &= ~jobs["title"].str.contains(TITLE_EXCLUSION_PATTERN, na=False)
+    print(f"Jobs after title exclusion filter: {keep.sum()}.")
     
-    if jobs.empty:
+    if not keep.any():
         print("No software engineering jobs found after filtering by title.")
         return
     
     # Filter out roles where 'is_remote' is populated and equals False.
     if config.IS_REMOTE and 'is_remote' in jobs.columns:
-        jobs = jobs[jobs["is_remote"].isnull() | (jobs["is_remote"] == True)]
-        print(f"Jobs after is_remote filter: {len(jobs)}.")
-        if jobs.empty:
+        keep &= jobs["is_remote"].isnull() | (jobs["is_remote"] == True)
+        print(f"Jobs after is_remote filter: {keep.sum()}.")
+        if not keep.any():
             print("No remote jobs found after filtering by is_remote flag.")
             return
 
     # Filter out rows that do not have a valid US location.
     if 'location' in jobs.columns:
-        jobs = jobs[jobs["location"].apply(is_us_location)]
-        print(f"Jobs after location filter: {len(jobs)}.")
-        if jobs.empty:
+        keep &= category_mask(jobs["location"], is_us_location, na=True)
+        print(f"Jobs after location filter: {keep.sum()}.")
+        if not keep.any():
             print("No jobs found with a valid US location after filtering by location.")
             return
 
     # Filter out jobs that are not fulltime. Only keep jobs with a job_type of "fulltime" (or null).
     if 'job_type' in jobs.columns:
-        jobs = jobs[(jobs['job_type'].isnull()) | (jobs['job_type'].str.lower().isin(['fulltime', 'full-time']))]
-        print(f"Jobs after job_type filter: {len(jobs)}.")
-        if jobs.empty:
+        keep &= category_mask(jobs['job_type'], lambda job_types: job_types.str.lower().isin(['fulltime', 'full-time']), na=True)
+        print(f"Jobs after job_type filter: {keep.sum()}.")
+        if not keep.any():
             print("No fulltime jobs found after filtering by job_type.")
             return
 
     # Filter out jobs that are hourly. Only keep jobs with an interval other than "hourly" (or null).
     if 'interval' in jobs.columns:
-        jobs = jobs[(jobs['interval'].isnull()) | (jobs['interval'].str.lower() != 'hourly')]
-        print(f"Jobs after interval filter: {len(jobs)}.")
-        if jobs.empty:
+        keep &= category_mask(jobs['interval'], lambda intervals: intervals.str.lower() != 'hourly', na=True)
+        print(f"Jobs after interval filter: {keep.sum()}.")
+        if not keep.any():
             print("No salary jobs found after filtering out hourly positions.")
             return
 
+    # Slice out the remaining rows, leaving out dropped columns that scoring does not need.
+    early_drops = [col for col in config.DROP_COLUMNS if col not in SCORING_COLUMNS]
+    jobs = jobs.loc[keep, ~jobs.columns.isin(early_drops)].copy()
+
     # Convert the 'date_posted' column to datetime (if available) so we can sort by recency.
+    # jobspy reports ISO dates, so the ISO8601 parser skips per-row format inference.
     if 'date_posted' in jobs.columns:
-        jobs['date_posted'] = pd.to_datetime(jobs['date_posted'], errors='coerce')
+        jobs['date_posted'] = pd.to_datetime(jobs['date_posted'], errors='coerce', format='ISO8601')
+
+    # Mark the description keywords once, then drop the description text (unless it is kept
+    # in the output) so scoring and sorting work on a narrow frame.
+    keyword_hits = keyword_matrix(jobs)
+    if 'description' in config.DROP_COLUMNS:
+        jobs = jobs.drop(columns='description', errors='ignore')
 
     # Compute the composite score for each job.
-    jobs['composite_score'] = jobs.apply(compute_composite_score, axis=1)
+    jobs['composite_score'] = compute_composite_score(jobs, keyword_hits)
 
-    # Sort jobs by most recent posting (date_posted) and then by composite score.
-    if 'date_posted' in jobs.columns:
-        jobs_sorted = jobs.sort_values(by=['composite_score','date_posted'], ascending=[False, False])
-    else:
-        jobs_sorted = jobs.sort_values(by='composite_score', ascending=False)
+    # Drop the rest of the unnecessary columns before sorting and writing to file.
+    jobs = jobs.drop(columns=config.DROP_COLUMNS, errors='ignore')
+
+    # Sort jobs by composite score and then by most recent posting (date_posted).
+    jobs_sorted = jobs.iloc[ranking_order(jobs)]
 
     print(f"Found {len(jobs_sorted)} jobs after filtering.")
 
-    # Drop unnecessary columns before writing to file.
-    jobs_sorted = jobs_sorted.drop(columns=config.DROP_COLUMNS, errors='ignore')
     print(jobs_sorted.head())
 
     # Create a unique filename using the current date and time as a prefix.
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"{timestamp}_jobs_sorted.csv"
+    if config.COMPRESS_OUTPUT:
+        filename += ".gz"
 
     # Export the sorted results to a CSV file.
-    jobs_sorted.to_csv(filename, quoting=csv.QUOTE_NONNUMERIC, escapechar="\\", index=False)
+    write_csv(jobs_sorted, filename)
     print(f"Results saved to {filename}.")
 
 if __name__ == '__main__':
@@ -0,0 +1,79 @@
+import pandas as pd
+
+import job_scraping
+
+
+def test_keyword_matrix_ignores_unicode_case_variants():
+    # "ſ" (long s) and "İ" match ASCII letters under re.IGNORECASE but do not lowercase to them;
+    # like a plain substring check, they must not count as keyword hits or break the scan.
+    jobs = pd.DataFrame({'description': ['AWſ experience', 'DİSTRIBUTED systems', 'AWS and Distributed']})
+    matrix = job_scraping.keyword_matrix(jobs)
+    aws = job_scraping.KEYWORDS.index('aws')
+    distributed = job_scraping.KEYWORDS.index('distributed')
+    assert matrix[:, aws].tolist() == [False, False, True]
+    assert matrix[:, distributed].tolist() == [False, False, True]
+
+
+def test_write_csv_falls_back_to_pandas_for_columns_arrow_cannot_write(tmp_path):
+    # Arrow converts list columns but its CSV writer rejects them.
+    jobs = pd.DataFrame({'title': ['Engineer', 'Developer'], 'emails': [['a@x.com'], ['b@y.com']]})
+    for filename in ('jobs.csv', 'jobs.csv.gz'):
+        path = tmp_path / filename
+        job_scraping.write_csv(jobs, str(path))
+        written = pd.read_csv(path)
+        assert written['title'].tolist() == ['Engineer', 'Developer']
+        assert written['emails'].tolist() == ["['a@x.com']", "['b@y.com']"]
+
+
+def test_composite_score_clips_instead_of_overflowing_int32():
+    jobs = pd.DataFrame({'min_amount': [3e9, -3e9, 100000.0], 'max_amount': [None, None, None]})
+    scores = job_scraping.compute_composite_score(jobs, job_scraping.keyword_matrix(jobs))
+    assert scores.tolist() == [2**31 - 1, -2**31, 100000]
+
+
+def _cached_run(monkeypatch, cache_dir):
+    scraped = pd.DataFrame({'title': ['Engineer'], 'min_amount': [100000.0]})
+    calls = []
+
+    def scrape():
+        calls.append(1)
+        return scraped.copy()
+
+    monkeypatch.setattr(job_scraping, 'scrape_all_sites', scrape)
+    monkeypatch.setattr(job_scraping.config, 'CACHE_SCRAPE_RESULTS', True)
+    monkeypatch.setattr(job_scraping.config, 'SCRAPE_CACHE_DIR', str(cache_dir))
+    return calls
+
+
+def test_load_jobs_keeps_scrape_when_cache_cannot_be_written(monkeypatch, tmp_path):
+    blocker = tmp_path / 'blocker'
+    blocker.write_text('not a directory')
+    calls = _cached_run(monkeypatch, blocker / 'sub')
+    assert job_scraping.load_jobs()['title'].tolist() == ['Engineer']
+    assert len(calls) == 1
+
+
+def test_load_jobs_scrapes_again_when_cache_is_corrupt(monkeypatch, tmp_path):
+    calls = _cached_run(monkeypatch, tmp_path)
+    job_scraping.scrape_cache_path().write_bytes(b'not parquet')
+    assert job_scraping.load_jobs()['title'].tolist() == ['Engineer']
+    assert len(calls) == 1
+
+
+def test_write_csv_writes_dates_without_time(tmp_path):
+    jobs = pd.DataFrame({'title': ['Engineer', 'Developer'],
+                         'date_posted': pd.to_datetime(['2024-01-02', None])})
+    path = tmp_path / 'jobs.csv'
+    job_scraping.write_csv(jobs, str(path))
+    assert '"2024-01-02"' in path.read_text()
+    assert '00:00:00' not in path.read_text()
+
+
+def test_write_path_keeps_salary_precision(monkeypatch, tmp_path):
+    jobs = pd.DataFrame({'title': ['Software Engineer'], 'location': ['Boston, MA'],
+                         'min_amount': [1234567.89], 'max_amount': [None]})
+    monkeypatch.setattr(job_scraping, 'load_jobs', lambda: jobs.copy())
+    monkeypatch.chdir(tmp_path)
+    job_scraping.main()
+    [output] = tmp_path.glob('*_jobs_sorted.csv*')
+    assert pd.read_csv(output)['min_amount'].tolist() == [1234567.89]